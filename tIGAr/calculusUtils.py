@@ -12,28 +12,134 @@ module can also be used in non-tIGAr FEniCS applications.
 # optimized for generality/readability rather than speed of execution.
 
 from dolfin import *
+import ufl
 from ufl import indices, rank, shape
-from ufl.classes import PermutationSymbol
+from ufl.classes import ComponentTensor, MultiIndex, Index
+from functools import lru_cache
+
+# The derivative of the mapping, the inverse and determinant of the metric,
+# and the Christoffel symbols are memoized and labeled as Variables, so that
+# every operator built on the same geometry refers back to a single UFL node
+# for each, and expressions assembled from them (e.g., the metric itself) are
+# structurally identical between calls.  UFL expressions hash and compare
+# structurally, and cannot be weakly referenced, so the caches are bounded.
+# Only these geometric quantities are cached; expressions involving other
+# arguments (e.g., test and trial functions) are not, to avoid keeping them
+# alive.
+_UFL_CACHE_SIZE = 128
+
+def _variable(expr):
+    """
+    Returns a UFL ``Variable`` wrapping ``expr``.  UFL cannot wrap 
+    expressions with free indices in a ``Variable``, so these are returned 
+    unchanged.
+    """
+    if(expr.ufl_free_indices):
+        return expr
+    return variable(expr)
+
+@lru_cache(maxsize=_UFL_CACHE_SIZE)
+def _gradF(F):
+    """
+    Returns the derivative of the mapping ``F``, as a ``Variable``.
+    """
+    return _variable(grad(F))
+
+@lru_cache(maxsize=_UFL_CACHE_SIZE)
+def _detMetric(g):
+    """
+    Returns the determinant of the metric tensor ``g``, as a ``Variable``
+    shared by all volume and surface elements computed from ``g``.
+    """
+    return _variable(det(g))
+
+@lru_cache(maxsize=_UFL_CACHE_SIZE)
+def _invMetric(g):
+    """
+    Returns the inverse of the metric tensor ``g``, as a ``Variable``, so
+    that the reciprocal of ``det(g)`` appears only once in forms using it.
+    """
+    return _variable(inv(g))
+
+def _DFinvMetric(F):
+    """
+    Returns the product of the derivative of the mapping ``F`` with the
+    inverse of the associated metric.  This is shared by ``mappedNormal()``
+    and (transposed) ``pinvD()``.
+    """
+    return dot(_gradF(F),_invMetric(getMetric(F)))
+
+def _replaceIndex(ii,i,j):
+    """
+    Returns a copy of the tuple ``ii`` (typically of indices), with the
+    ``i``-th entry replaced by ``j``.
+    """
+    ii = list(ii)
+    ii[i] = j
+    return tuple(ii)
+
+def _renameIndices(expr,mapping,cache):
+    """
+    Returns ``expr`` with its free indices renamed according to the dictionary
+    ``mapping``.  Subexpressions that are unaffected (in particular, anything
+    without free indices, such as a ``Variable``) are returned as-is, so that
+    shared nodes remain shared.  ``cache`` maps ids of already-processed
+    subexpressions to their results.
+    """
+    if(isinstance(expr,MultiIndex)):
+        ii = tuple(mapping.get(i,i) for i in expr.indices())
+        if(ii == expr.indices()):
+            return expr
+        return MultiIndex(ii)
+    if(expr._ufl_is_terminal_ or not expr.ufl_free_indices):
+        return expr
+    key = id(expr)
+    if(key not in cache):
+        ops = tuple(_renameIndices(op,mapping,cache)
+                    for op in expr.ufl_operands)
+        if(all(a is b for a,b in zip(ops,expr.ufl_operands))):
+            cache[key] = expr
+        else:
+            cache[key] = expr._ufl_expr_reconstruct_(*ops)
+    return cache[key]
+
+def _indexedSimplify(A,ii):
+    """
+    Returns ``A[ii]``.  If ``A`` was created by ``as_tensor`` from a scalar
+    expression with free indices, the indices ``ii`` are substituted directly
+    into that expression, rather than wrapping an extra ``Indexed`` node
+    around the ``ComponentTensor``.
+    """
+    if(isinstance(A,ComponentTensor)
+       and all(isinstance(i,Index) for i in ii)
+       and len(set(ii)) == len(ii)):
+        body, jj = A.ufl_operands
+        return _renameIndices(body,dict(zip(jj.indices(),ii)),{})
+    return A[ii]
 
 def getMetric(F):
     """
     Returns a metric tensor corresponding to a given mapping ``F`` from 
     parametric to physical space.
     """
-    DF = grad(F)
-    return DF.T*DF
+    # neither wrapped in a Variable nor written with "*" (which introduces
+    # new free indices), so that metrics computed from the same F compare 
+    # equal, and share the cached inverse and determinant
+    DF = _gradF(F)
+    return dot(DF.T,DF)
 
+@lru_cache(maxsize=_UFL_CACHE_SIZE)
 def getChristoffel(g):
     """
     Returns Christoffel symbols associated with a metric tensor ``g``.  Indices
     are ordered based on the assumption that the first index is the raised one.
     """
     a,b,c,d = indices(4)
-    return as_tensor\
-        (0.5*inv(g)[a,b]\
+    return _variable(as_tensor\
+        (0.5*_invMetric(g)[a,b]\
          *(grad(g)[c,b,d]\
            + grad(g)[d,b,c]\
-           - grad(g)[d,c,b]), (a,d,c))
+           - grad(g)[d,c,b]), (a,d,c)))
 
 def mappedNormal(N,F,normalize=True):
     """
@@ -43,11 +149,9 @@ def mappedNormal(N,F,normalize=True):
     ``normalize = False``.  In that case, the magnitude is the ratio of 
     deformed to reference area elements.
     """
-    DF = grad(F)
-    g = getMetric(F)
-    n = DF*inv(g)*N
+    n = _variable(_DFinvMetric(F)*N)
     if(normalize):
-        return n/sqrt(inner(n,n))
+        return _variable(n/sqrt(inner(n,n)))
     else:
         return n
     # sanity check: consistent w/ Nanson formula for invertible DF,
@@ -58,15 +162,14 @@ def pinvD(F):
     Returns the Moore--Penrose pseudo-inverse of the derivative of the mapping
     ``F``.
     """
-    DF = grad(F)
-    g = getMetric(F)
-    return inv(g)*DF.T
+    # the metric is symmetric, so inv(g)*DF.T == (DF*inv(g)).T
+    return _DFinvMetric(F).T
     
 def volumeJacobian(g):
     """
     Returns the volume element associated with the metric ``g``.
     """
-    return sqrt(det(g))
+    return _variable(sqrt(_detMetric(g)))
     
 def surfaceJacobian(g,N):
     """
@@ -77,7 +180,9 @@ def surfaceJacobian(g,N):
     incorrect results with quad/hex elements.  Use of this in boundary 
     integrals is only robust with simplices.  
     """
-    return sqrt(det(g)*inner(N,inv(g)*N))
+    dg = _detMetric(g)
+    invg = _invMetric(g)
+    return _variable(sqrt(dg*inner(N,invg*N)))
 
 # class for tensors in curvilinear coordinates w/ metric g
 class CurvilinearTensor:
@@ -89,18 +194,19 @@ class CurvilinearTensor:
         """
         Create a ``CurvilinearTensor`` with components given by the UFL tensor
         ``T``, on a manifold with metric ``g``.  The sequence of Booleans
-        ``lowered`` indicates whether or not each index is lowered.  The 
-        default is for all indices to be lowered.
+        ``lowered`` indicates whether or not each index is lowered, and is
+        stored as a tuple.  The default is for all indices to be lowered.
         """
         self.T = T
         self.g = g
+        # the shape of a UFL expression is stored, so this avoids re-deriving
+        # the rank from T every time it is needed
+        self._rank = len(T.ufl_shape)
         if(lowered != None):
-            self.lowered = lowered
+            self.lowered = tuple(lowered)
         else:
             # default: all lowered indices
-            self.lowered = []
-            for i in range(0,rank(T)):
-                self.lowered += [True,]
+            self.lowered = (True,)*self._rank
                 
     def __add__(self,other):
         # TODO: add consistency checks on g and lowered
@@ -118,19 +224,19 @@ class CurvilinearTensor:
         """
         Flips the raised/lowered status of the ``i``-th index.
         """
-        n = rank(self.T)
+        n = self._rank
         ii = indices(n+1)
         mat = self.g
         if(self.lowered[i]):
-            mat = inv(self.g)
+            mat = _invMetric(self.g)
         else:
             mat = self.g
-        retval = as_tensor(self.T[ii[0:i]+(ii[i],)+ii[i+1:n]]\
+        retval = as_tensor(_indexedSimplify(self.T,ii[0:n])\
                            *mat[ii[i],ii[n]],\
-                           ii[0:i]+(ii[n],)+ii[i+1:n])
+                           _replaceIndex(ii[0:n],i,ii[n]))
         return CurvilinearTensor(retval,self.g,\
-                                 self.lowered[0:i]\
-                                 +[not self.lowered[i],]+self.lowered[i+1:])
+                                 _replaceIndex(self.lowered,i,\
+                                               not self.lowered[i]))
     def raiseIndex(self,i):
         """
         Returns an associated tensor with the ``i``-th index raised.
@@ -153,8 +259,10 @@ class CurvilinearTensor:
         """
         Returns an associated tensor with all indices raised.
         """
+        if(not any(self.lowered)):
+            return self
         retval = self
-        for i in range(0,rank(self.T)):
+        for i in range(0,self._rank):
             retval = retval.raiseIndex(i)
         return retval
 
@@ -162,8 +270,10 @@ class CurvilinearTensor:
         """
         Returns an associated tensor with all indices lowered.
         """
+        if(all(self.lowered)):
+            return self
         retval = self
-        for i in range(0,rank(self.T)):
+        for i in range(0,self._rank):
             retval = retval.lowerIndex(i)
         return retval
 
@@ -171,7 +281,7 @@ class CurvilinearTensor:
         """
         Returns the rank of the tensor.
         """
-        return rank(self.T)
+        return self._rank
 
 def curvilinearInner(T,S):
     """
@@ -182,48 +292,58 @@ def curvilinearInner(T,S):
     """
     Tsharp = T.sharp();
     Sflat = S.flat();
-    ii = indices(rank(T.T))
-    return as_tensor(Tsharp.T[ii]*Sflat.T[ii],())
+    ii = indices(T._rank)
+    return as_tensor(_indexedSimplify(Tsharp.T,ii)\
+                     *_indexedSimplify(Sflat.T,ii),())
 
-# TODO: check/test more thoroughly
-def covariantDerivative(T):
+def _covariantDerivative(T):
     """
-    Returns a ``CurvilinearTensor`` that is the covariant derivative of
-    the ``CurvilinearTensor`` argument ``T``.
+    Returns the components of the covariant derivative of the 
+    ``CurvilinearTensor`` argument ``T``, as a ``ComponentTensor`` that 
+    other operators can index into directly.
     """
-    n = rank(T.T)
+    n = T._rank
     ii = indices(n+2)
     g = T.g
     gamma = getChristoffel(g)
-    retval = grad(T.T)
+    # build all contributions as scalar expressions in the free indices
+    # ii[0:n+1], then sum them and convert to a tensor in a single step
+    free = ii[0:n+1]
+    terms = [grad(T.T)[free],]
     for i in range(0,n):
         # use ii[n] as the new index of the covariant deriv
-        # use ii[n+1] as dummy index
+        # use ii[n+1] as dummy index; the repeated dummy index makes each
+        # term an IndexSum
+        Ti = _indexedSimplify(T.T,_replaceIndex(free[0:n],i,ii[n+1]))
         if(T.lowered[i]):
-            retval -= as_tensor(T.T[ii[0:i]+(ii[n+1],)+ii[i+1:n]]\
-                                *gamma[(ii[n+1],ii[i],ii[n])],\
-                                ii[0:n+1])
+            terms += [-Ti*gamma[(ii[n+1],ii[i],ii[n])],]
         else:
-            retval += as_tensor(T.T[ii[0:i]+(ii[n+1],)+ii[i+1:n]]\
-                                *gamma[(ii[i],ii[n+1],ii[n])],\
-                                ii[0:n+1])
-    newLowered = T.lowered+[True,]
-    return CurvilinearTensor(retval,g,newLowered)
+            terms += [Ti*gamma[(ii[i],ii[n+1],ii[n])],]
+    return as_tensor(sum(terms[1:],terms[0]),free)
+
+# TODO: check/test more thoroughly
+def covariantDerivative(T):
+    """
+    Returns a ``CurvilinearTensor`` that is the covariant derivative of
+    the ``CurvilinearTensor`` argument ``T``.
+    """
+    newLowered = T.lowered+(True,)
+    return CurvilinearTensor(variable(_covariantDerivative(T)),T.g,newLowered)
 
 def curvilinearGrad(T):
     """
     Returns the gradient of ``CurvilinearTensor`` argument ``T``, i.e., the
     covariant derivative with the last index raised.
     """
-    n = rank(T.T)
+    n = T._rank
     ii = indices(n+2)
     g = T.g
-    deriv = covariantDerivative(T)
-    invg = inv(g)
+    deriv = _covariantDerivative(T)
+    invg = _invMetric(g)
     # raise last index
-    retval = as_tensor(deriv.T[ii[0:n+1]]*invg[ii[n:n+2]],\
-                       ii[0:n]+(ii[n+1],))
-    return CurvilinearTensor(retval,g,T.lowered+[False,])
+    retval = as_tensor(_indexedSimplify(deriv,ii[0:n+1])*invg[ii[n:n+2]],\
+                       _replaceIndex(ii[0:n+1],n,ii[n+1]))
+    return CurvilinearTensor(variable(retval),g,T.lowered+(False,))
 
 def curvilinearDiv(T):
     """
@@ -234,7 +354,7 @@ def curvilinearDiv(T):
     NOTE: This operation is invalid for tensors that do not 
     contain at least one raised index.
     """
-    n = rank(T.T)
+    n = T._rank
     ii = indices(n)
     g = T.g
     j = -1 # last raised index
@@ -242,10 +362,10 @@ def curvilinearDiv(T):
         if(not T.lowered[i]):
             j = i
     if(j == -1):
-        print("ERROR: Divergence operator requires at least one raised index.")
-        exit()
-    deriv = covariantDerivative(T)
-    retval = as_tensor(deriv.T[ii[0:n]+(ii[j],)],ii[0:j]+ii[j+1:n])
+        raise ValueError("Divergence operator requires at least one "
+                         +"raised index.")
+    deriv = _covariantDerivative(T)
+    retval = as_tensor(deriv[ii[0:n]+(ii[j],)],ii[0:j]+ii[j+1:n])
     return CurvilinearTensor(retval,g,T.lowered[0:j]+T.lowered[j+1:n])
 
 # Cartesian differential operators in deformed configuration
@@ -258,7 +378,7 @@ def cartesianGrad(f,F):
     coordinates, assuming the parametric domain has been mapped to its
     physical configuration by the mapping ``F``.
     """
-    return dot(grad(f),pinvD(F))
+    return _variable(dot(grad(f),pinvD(F)))
     #n = rank(f)
     #ii = indices(n+2)
     #pinvDF = pinvD(F)
@@ -271,9 +391,12 @@ def cartesianDiv(f,F):
     The divergence operator corresponding to ``cartesianGrad(f,F)`` that 
     sums on the last two indices.
     """
+    # contract directly against the pseudo-inverse, rather than building the
+    # full gradient tensor and then contracting it
     n = rank(f)
-    ii = indices(n)
-    return as_tensor(cartesianGrad(f,F)[ii+(ii[n-1],)],ii[0:n-1])
+    ii = indices(n+1)
+    pinvDF = pinvD(F)
+    return as_tensor(grad(f)[ii[0:n+1]]*pinvDF[ii[n],ii[n-1]],ii[0:n-1])
 
 def cartesianCurl(f,F):
     """
@@ -285,13 +408,15 @@ def cartesianCurl(f,F):
     gradf = cartesianGrad(f,F)
     if(n==1):
         m = shape(f)[0]
-        eps = PermutationSymbol(m)
+        # write out the nonzero terms of the permutation symbol contraction
+        # explicitly, rather than leaving the form compiler to discover
+        # that the remaining terms vanish
         if(m == 3):
-            (i,j,k) = indices(3)
-            return as_tensor(eps[i,j,k]*gradf[k,j],(i,))
+            return as_vector((gradf[2,1]-gradf[1,2],
+                              gradf[0,2]-gradf[2,0],
+                              gradf[1,0]-gradf[0,1]))
         elif(m == 2):
-            (j,k) = indices(2)
-            return eps[j,k]*gradf[k,j]
+            return gradf[1,0]-gradf[0,1]
         else:
             print("ERROR: Unsupported dimension of argument to curl.")
             exit()
@@ -310,7 +435,7 @@ def cartesianPushforwardN(u,F):
     used for a Nedelec element, hence "N").  This is only valid for 3D vector
     fields on 3D domains.  
     """
-    DF = grad(F)
+    DF = _gradF(F)
     return inv(DF.T)*u
 
     # Since it only really makes sense to use this pushforward in 3D,
@@ -322,7 +447,7 @@ def cartesianPushforwardRT(v,F):
     The div-conserving pushforward of ``v`` by mapping ``F`` (as might be
     used for a Raviart--Thomas element, hence "RT").
     """
-    DF = grad(F)
+    DF = _gradF(F)
     #return DF*v/det(DF)
     
     # Note: the metric is used for the Jacobian here to make sure this
@@ -333,7 +458,7 @@ def cartesianPushforwardRT(v,F):
     # co-dimension zero case, to avoid the unnecessary extra operations.
 
     g = getMetric(F)
-    return DF*v/sqrt(det(g))
+    return DF*v/volumeJacobian(g)
     
 def cartesianPushforwardW(phi,F):
     """
@@ -343,8 +468,20 @@ def cartesianPushforwardW(phi,F):
     #DF = grad(F)
     #return phi/det(DF)
     g = getMetric(F)
-    return phi/sqrt(det(g))
+    return phi/volumeJacobian(g)
     
+def _setupMeasure(meas,quadDeg,boundaryMarkers):
+    """
+    Returns ``meas`` with its quadrature degree set to ``quadDeg`` and its
+    ``subdomain_data`` set to ``boundaryMarkers``, where either is applied 
+    only if it is not ``None``.
+    """
+    if(quadDeg != None):
+        meas = meas(metadata={'quadrature_degree': quadDeg})
+    if(boundaryMarkers != None):
+        meas = meas(subdomain_data=boundaryMarkers)
+    return meas
+
 # TODO: rename this to ScaledMeasure
 # I can't just scale a measure by a Jacobian, so I'll store them separately,
 # then overload __rmul__()
@@ -376,13 +513,10 @@ class tIGArMeasure:
         to set ``subdomain_data`` of ``meas``, to perform integrals over
         specific sub-domains.
         """
-        if(quadDeg != None):
-            # TODO: is this reflected in the calling scope?
-            meas = meas(metadata={'quadrature_degree': quadDeg})
-        if(boundaryMarkers != None):
-            meas = meas(subdomain_data=boundaryMarkers)
-        self.meas = meas
+        self.meas = _setupMeasure(meas,quadDeg,boundaryMarkers)
         self.J = J
+        # UFL measures restricted to particular subdomains, by marker
+        self._subMeasures = {}
 
     def setMarkers(self,markers):
         """
@@ -390,6 +524,7 @@ class tIGArMeasure:
         ``markers``.  
         """
         self.meas = self.meas(subdomain_data=markers)
+        self._subMeasures = {}
         
         
     # TODO: should probably change name of argument so that the measure
@@ -401,7 +536,11 @@ class tIGArMeasure:
         syntax that one would use to change ``subdomain_data`` of an
         ordinary measure.
         """
-        return tIGArMeasure(self.J,self.meas(marker))
+        # only the UFL measure is shared between calls; a new tIGArMeasure is
+        # returned each time, since it can be modified by setMarkers()
+        if(marker not in self._subMeasures):
+            self._subMeasures[marker] = self.meas(marker)
+        return tIGArMeasure(self.J,self._subMeasures[marker])
         
     def __rmul__(self, other):
         """
@@ -409,10 +548,54 @@ class tIGArMeasure:
         """
         return (other*self.J)*self.meas
 
+# Gauss--Legendre points and weights on the interval (-1,1), indexed by the
+# number of points.
+_GAUSS_LEGENDRE = {1:([0.0,],
+                      [2.0,]),
+                   2:([-0.5773502691896257645091488,
+                       0.5773502691896257645091488],
+                      [1.0,
+                       1.0]),
+                   3:([-0.77459666924148337703585308,
+                       0.0,
+                       0.77459666924148337703585308],
+                      [0.55555555555555555555555556,
+                       0.88888888888888888888888889,
+                       0.55555555555555555555555556]),
+                   4:([-0.86113631159405257524,
+                       -0.33998104358485626481,
+                       0.33998104358485626481,
+                       0.86113631159405257524],
+                      [0.34785484513745385736,
+                       0.65214515486254614264,
+                       0.65214515486254614264,
+                       0.34785484513745385736])}
+
+def _gaussLegendre(n):
+    """
+    Returns lists of ``n`` points and weights from ``_GAUSS_LEGENDRE``.
+    """
+    if(n not in _GAUSS_LEGENDRE):
+        raise ValueError("No quadrature rule for n="+str(n)+".")
+    return _GAUSS_LEGENDRE[n]
+
+# Each Constant is a separate coefficient of any form it appears in, so
+# quadrature data is wrapped once and shared between calls.  Only values from
+# _GAUSS_LEGENDRE (and their halves) are ever passed in, so the number of
+# entries is small in any case.
+@lru_cache(maxsize=_UFL_CACHE_SIZE)
+def _quadConstant(x):
+    """
+    Returns a ``Constant`` with the value ``x``.  The same object is returned
+    to every caller, so it must not be modified with ``assign()``.
+    """
+    return Constant(x)
+
 def getQuadRule(n):
     """
     Return a list of points and a list of weights for integration over the
-    interval (-1,1), using ``n`` quadrature points.  
+    interval (-1,1), using ``n`` quadrature points.  Rules are available
+    for ``n`` from 1 to 4; other values raise a ``ValueError``.
 
     NOTE: This functionality is mainly intended
     for use in through-thickness integration of Kirchhoff--Love shell
@@ -420,51 +603,53 @@ def getQuadRule(n):
     formulations using a mixed element to combine DoFs from various time
     levels.
     """
-    if(n==1):
-        xi = [Constant(0.0),]
-        w = [Constant(2.0),]
-        return (xi,w)
-    if(n==2):
-        xi = [Constant(-0.5773502691896257645091488),
-              Constant(0.5773502691896257645091488)]
-        w = [Constant(1.0),
-             Constant(1.0)]
-        return (xi,w)
-    if(n==3):
-        xi = [Constant(-0.77459666924148337703585308),
-              Constant(0.0),
-              Constant(0.77459666924148337703585308)]
-        w = [Constant(0.55555555555555555555555556),
-             Constant(0.88888888888888888888888889),
-             Constant(0.55555555555555555555555556)]
-        return (xi,w)
-    if(n==4):
-        xi = [Constant(-0.86113631159405257524),
-              Constant(-0.33998104358485626481),
-              Constant(0.33998104358485626481),
-              Constant(0.86113631159405257524)]
-        w = [Constant(0.34785484513745385736),
-             Constant(0.65214515486254614264),
-             Constant(0.65214515486254614264),
-             Constant(0.34785484513745385736)]
-        return (xi,w)
-    
     # TODO: add more quadrature rules (or, try to find a function in scipy or
     # another common library, to generate arbitrary Gaussian quadrature
     # rules on-demand).
-    
-    print("ERROR: invalid number of quadrature points requested.")
-    exit()
+    xi_raw, w_raw = _gaussLegendre(n)
+    xi = [_quadConstant(x) for x in xi_raw]
+    w = [_quadConstant(x) for x in w_raw]
+    return (xi,w)
 
 def getQuadRuleInterval(n,L):
     """
     Returns an ``n``-point quadrature rule for the interval 
     (-``L``/2,``L``/2), consisting of a list of points and list of weights.
     """
-    xi_hat, w_hat = getQuadRule(n)
-    xi = []
-    w = []
-    for i in range(0,n):
-        xi += [L*xi_hat[i]/2.0,]
-        w += [L*w_hat[i]/2.0,]
+    # scale the cached half-interval rule by the length, which may be
+    # either a number or a UFL expression
+    xi_raw, w_raw = _gaussLegendre(n)
+    xi = [L*_quadConstant(x/2.0) for x in xi_raw]
+    w = [L*_quadConstant(x/2.0) for x in w_raw]
     return (xi,w)
+
+# Compiled DOLFIN forms, keyed by the id of the UFL form they were created
+# from.  The UFL form is stored alongside, to detect re-use of ids.
+_compiledForms = {}
+
+def assembleCached(form,**kwargs):
+    """
+    Assembles the UFL ``form``, passing ``kwargs`` through to ``assemble``.
+    The compiled DOLFIN ``Form`` is retained, so that assembling the same
+    ``form`` object again (e.g., in every iteration of a nonlinear solver or
+    every step of a time integrator) skips re-creating the DOLFIN ``Form``
+    and looking up its JIT-compiled module.  Note that the generated code 
+    itself is already cached on disk by DOLFIN's JIT compiler, keyed on the
+    form signature and compiler version, so it persists between runs.
+
+    NOTE: Up to a fixed number of forms, along with everything they refer
+    to (meshes, function spaces, coefficients), are kept alive by the cache,
+    so this is only worthwhile for forms that are re-assembled many times.
+    """
+    if(not isinstance(form,ufl.Form)):
+        # already compiled
+        return assemble(form,**kwargs)
+    fcp = kwargs.pop("form_compiler_parameters",None)
+    entry = _compiledForms.get(id(form))
+    if(entry == None or entry[0] is not form or entry[1] != fcp):
+        if(len(_compiledForms) >= _UFL_CACHE_SIZE):
+            # evict the oldest entry
+            del _compiledForms[next(iter(_compiledForms))]
+        entry = (form,fcp,Form(form,form_compiler_parameters=fcp))
+        _compiledForms[id(form)] = entry
+    return assemble(entry[2],**kwargs)